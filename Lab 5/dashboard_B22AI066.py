@@ -1,7 +1,34 @@
 from shiny import App, reactive, ui, render
 import pandas as pd
 import numpy as np
+import functools
+import os
 import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+from shinywidgets import output_widget, render_widget
+
+try:
+    import pyarrow.csv as pac
+except ImportError:
+    pac = None
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+# Parse uploads with polars instead of pyarrow when it is installed
+USE_POLARS = False
+
+# Rows parsed up front for the preview grid and column pickers
+PREVIEW_ROWS = 500
+# Uploads larger than this only parse the columns a plot or metric actually uses
+LARGE_FILE_BYTES = 200 * 1024 * 1024
+
+# Above this many rows, plots are binned server-side instead of shipping every row
+RASTER_ROWS = 50_000
+RASTER_BINS = 200
 
 # Define a color scheme
 app_ui = ui.page_fluid(
@@ -77,9 +104,9 @@ app_ui = ui.page_fluid(
     ui.div(
         ui.h3("CSV Preview", class_="section-header"),
         ui.div(
-            ui.output_ui("csv_table_html"),
+            ui.output_data_frame("csv_preview"),
             class_="preview-container",
-            style="height:300px; overflow-y:scroll; padding:15px;"
+            style="padding:15px;"
         ),
         class_="section-card"
     ),
@@ -99,7 +126,7 @@ app_ui = ui.page_fluid(
     ui.div(
         ui.h3("Plots for Selected Columns", class_="section-header"),
         ui.div(
-            ui.output_ui("eda_plot"),
+            output_widget("eda_plot"),
             class_="plot-container"
         ),
         class_="section-card"
@@ -108,28 +135,184 @@ app_ui = ui.page_fluid(
     ui.div(
         ui.h3("Distribution Plot of Chosen Column", class_="section-header"),
         ui.div(
-            ui.output_ui("dist_plot"),
+            output_widget("dist_plot"),
             class_="plot-container"
         ),
         class_="section-card"
     )
 )
 
+def header_names(fpath):
+    # Column names as pandas' parser gives them: blank headers become "Unnamed: i" and
+    # repeats become x.1, x.2. The preview uses the same names, so its column pickers
+    # always match the full parse
+    return list(pd.read_csv(fpath, nrows=0).columns)
+
+def read_csv(fpath, columns=None):
+    # Multi-threaded parse with polars/pyarrow; fall back to pandas' C parser without them.
+    # If columns is given, the others are dropped before they are parsed.
+    if USE_POLARS and pl is not None:
+        lazy = pl.scan_csv(fpath, new_columns=header_names(fpath))
+        if columns is not None:
+            lazy = lazy.select(list(columns))
+        return lazy.collect().to_pandas()
+    if pac is not None:
+        convert_options = pac.ConvertOptions()
+        if columns is not None:
+            convert_options.include_columns = list(columns)
+        tbl = pac.read_csv(
+            fpath,
+            # pyarrow would keep blank and repeated header names as they are
+            read_options=pac.ReadOptions(use_threads=True, column_names=header_names(fpath), skip_rows=1),
+            convert_options=convert_options
+        )
+        return tbl.to_pandas()
+    return pd.read_csv(fpath, usecols=None if columns is None else list(columns))
+
+def column_type(series, nunique):
+    # Simple check to categorize numeric vs. categorical
+    if pd.api.types.is_numeric_dtype(series):
+        return "numeric"
+    if nunique <= 20:
+        return "categorical"
+    return "numeric"  # naive fallback
+
+def column_metrics(col, series, col_type, nunique, mode_val):
+    # Row of the metrics table for one column
+    if col_type == "numeric":
+        # Text columns can fall back to "numeric"; they have no mean/median/std
+        has_stats = pd.api.types.is_numeric_dtype(series)
+        return {
+            "Column": col,
+            "Type": "Numeric",
+            "Mean": round(series.mean(), 2) if has_stats else None,
+            "Median": round(series.median(), 2) if has_stats else None,
+            "Mode": mode_val,
+            "Std": round(series.std(), 2) if has_stats else None
+        }
+    return {
+        "Column": col,
+        "Type": "Categorical",
+        "Count": len(series),
+        "Unique": nunique,
+        "Mode": mode_val
+    }
+
+def describe(data):
+    # Per-column metadata computed once per upload so renderers only do lookups
+    meta = {}
+    for c in data.columns:
+        series = data[c]
+        nunique = series.nunique(dropna=True)
+        mode = series.mode(dropna=True)
+        mode_val = mode.iloc[0] if not mode.empty else None
+        col_type = column_type(series, nunique)
+        meta[c] = {
+            "type": col_type,
+            "nunique": nunique,
+            "mode": mode_val,
+            "metrics": column_metrics(c, series, col_type, nunique, mode_val)
+        }
+    return {"df": data, "columns": list(data.columns), "meta": meta}
+
+# Uploads are cached on file identity, so unrelated invalidations don't re-parse
+@functools.lru_cache(maxsize=4)
+def load_preview(fpath, mtime, size):
+    return pd.read_csv(fpath, nrows=PREVIEW_ROWS)
+
+@functools.lru_cache(maxsize=4)
+def load_dataset(fpath, mtime, size, columns=None):
+    return describe(read_csv(fpath, columns))
+
+def numeric_values(series):
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype=float)
+
+def binned_histogram(series, bins=RASTER_BINS):
+    # Histogram with counts computed here, so the payload is O(bins) rather than O(rows)
+    values = numeric_values(series)
+    counts, edges = np.histogram(values[~np.isnan(values)], bins=bins)
+    fig = px.bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, labels={"x": series.name, "y": "count"})
+    fig.update_layout(bargap=0)
+    return fig
+
+def counts_bar(series):
+    counts = series.value_counts()
+    return px.bar(x=counts.index, y=counts.to_numpy(), labels={"x": series.name, "y": "count"})
+
+def density_matrix(data, cols, bins=RASTER_BINS // 2):
+    # Scatter matrix rasterized into 2D histograms: O(bins^2) per panel instead of O(rows)
+    values = {c: numeric_values(data[c]) for c in cols}
+    n = len(cols)
+    fig = make_subplots(rows=n, cols=n, horizontal_spacing=0.02, vertical_spacing=0.02)
+    for i, y_col in enumerate(cols):
+        for j, x_col in enumerate(cols):
+            x, y = values[x_col], values[y_col]
+            if i == j:
+                x = x[~np.isnan(x)]
+                counts, edges = np.histogram(x, bins=bins)
+                trace = go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, marker_color="#3498db")
+            else:
+                mask = ~(np.isnan(x) | np.isnan(y))
+                counts, x_edges, y_edges = np.histogram2d(x[mask], y[mask], bins=bins)
+                trace = go.Heatmap(
+                    x=(x_edges[:-1] + x_edges[1:]) / 2,
+                    y=(y_edges[:-1] + y_edges[1:]) / 2,
+                    z=np.where(counts.T > 0, np.log1p(counts.T), np.nan),
+                    colorscale="Viridis",
+                    showscale=False
+                )
+            fig.add_trace(trace, row=i + 1, col=j + 1)
+        fig.update_xaxes(title_text=y_col, row=n, col=i + 1)
+        fig.update_yaxes(title_text=y_col, row=i + 1, col=1)
+    fig.update_layout(height=max(300, 200 * n), showlegend=False, bargap=0)
+    return fig
+
+def message_figure(text):
+    # Placeholder figure so widget outputs can still show a status message
+    fig = go.Figure()
+    fig.add_annotation(text=text, showarrow=False, font=dict(size=16))
+    fig.update_layout(xaxis_visible=False, yaxis_visible=False, height=150, template="plotly_white")
+    return fig
+
 def server(input, output, session):
     @reactive.Calc
-    def df():
+    def upload():
         file_info = input.file()
         if not file_info:
-            return pd.DataFrame()
+            return None
         fpath = file_info[0]["datapath"]
-        return pd.read_csv(fpath)
+        st = os.stat(fpath)
+        return fpath, st.st_mtime, st.st_size
+
+    @reactive.Calc
+    def preview():
+        # First rows only: enough for the preview grid and the column pickers
+        key = upload()
+        if key is None:
+            return pd.DataFrame()
+        return load_preview(*key)
+
+    def dataset(columns):
+        # Full parse, deferred until a metric or plot needs it; large files only parse `columns`
+        key = upload()
+        if key is None:
+            return describe(pd.DataFrame())
+        if key[2] > LARGE_FILE_BYTES:
+            return load_dataset(*key, tuple(columns))
+        return load_dataset(*key)
+
+    def known_columns(cols):
+        # Drop selections left over from a previous upload
+        if not cols:
+            return []
+        return [c for c in cols if c in preview().columns]
 
     @output
     @render.ui
     def dist_col_ui():
-        if df().empty:
+        cols = list(preview().columns)
+        if not cols:
             return ui.div("No data loaded.")
-        cols = list(df().columns)
         return ui.input_select("dist_col", "Select a column:", choices={c: c for c in cols})
 
     @reactive.Calc
@@ -137,108 +320,97 @@ def server(input, output, session):
         return input.dist_col()
 
     @output
-    @render.ui
-    def csv_table_html():
-        # Properly render table as HTML
-        if df().empty:
-            return ui.div("No file loaded.")
-        return ui.HTML(df().head(50).to_html(index=False))
+    @render.data_frame
+    def csv_preview():
+        # Virtualized grid: only the rows in view are mounted, and it scrolls within its own height
+        data = preview()
+        if data.empty:
+            return render.DataGrid(pd.DataFrame({"Info": ["No file loaded."]}))
+        return render.DataGrid(data, height="300px", filters=True)
 
     @output
     @render.ui
     def eda_col_ui():
-        if df().empty:
+        cols = list(preview().columns)
+        if not cols:
             return ui.div("No data loaded.")
         # Provide multi-column selection using input_select
         return ui.input_select(
             "eda_cols",
             "Select columns:",
-            choices={c: c for c in df().columns},
+            choices={c: c for c in cols},
             multiple=True
         )
 
-    def column_type(series):
-        # Simple check to categorize numeric vs. categorical
-        if pd.api.types.is_numeric_dtype(series):
-            return "numeric"
-        else:
-            unique_vals = series.nunique()
-            if unique_vals <= 20:
-                return "categorical"
-            return "numeric"  # naive fallback
-
     @reactive.Calc
     def selected_columns():
-        return input.eda_cols()
+        return known_columns(input.eda_cols())
 
     @output
     @render.table
     def metrics_table():
         # Keep this table render the same
-        data = df()
         cols = selected_columns()
-        if data.empty or not cols:
+        if not cols:
             return pd.DataFrame({"Info": ["No columns selected."]})
-        metrics_list = []
-        for col in cols:
-            col_type = column_type(data[col])
-            if col_type == "numeric":
-                values = data[col].dropna()
-                metrics_list.append({
-                    "Column": col,
-                    "Type": "Numeric",
-                    "Mean": round(values.mean(), 2),
-                    "Median": round(values.median(), 2),
-                    "Mode": values.mode().iloc[0] if not values.mode().empty else None,
-                    "Std": round(values.std(), 2)
-                })
-            else:
-                mode_val = data[col].mode().iloc[0] if not data[col].mode().empty else None
-                metrics_list.append({
-                    "Column": col,
-                    "Type": "Categorical",
-                    "Count": len(data[col]),
-                    "Unique": data[col].nunique(),
-                    "Mode": mode_val
-                })
+        ds = dataset(cols)
+        if ds["df"].empty:
+            return pd.DataFrame({"Info": ["No columns selected."]})
+        metrics_list = [ds["meta"][col]["metrics"] for col in cols]
         return pd.DataFrame(metrics_list)
 
     @output
-    @render.ui
+    @render_widget
     def eda_plot():
-        data = df()
         cols = selected_columns()
-        if data.empty or not cols:
-            return ui.div("No columns selected.")
-        numeric_cols = [c for c in cols if column_type(data[c]) == "numeric"]
+        if not cols:
+            return message_figure("No columns selected.")
+        ds = dataset(cols)
+        data = ds["df"]
+        if data.empty:
+            return message_figure("No columns selected.")
+        numeric_cols = [c for c in cols if ds["meta"][c]["type"] == "numeric"]
+        large = len(data) > RASTER_ROWS
 
         if len(numeric_cols) > 1:
-            fig = px.scatter_matrix(data, dimensions=numeric_cols)
+            if large:
+                fig = density_matrix(data, numeric_cols)
+            else:
+                fig = px.scatter_matrix(data, dimensions=numeric_cols)
         elif len(numeric_cols) == 1:
-            fig = px.histogram(data, x=numeric_cols[0])
+            if large:
+                fig = binned_histogram(data[numeric_cols[0]])
+            else:
+                fig = px.histogram(data, x=numeric_cols[0])
         else:
             # If there's any categorical column, plot bar chart of the first one
-            cat_cols = [c for c in cols if column_type(data[c]) == "categorical"]
+            cat_cols = [c for c in cols if ds["meta"][c]["type"] == "categorical"]
             if cat_cols:
-                fig = px.bar(data, x=cat_cols[0])
+                if large:
+                    fig = counts_bar(data[cat_cols[0]])
+                else:
+                    fig = px.bar(data, x=cat_cols[0])
             else:
-                return ui.div("No valid columns to plot.")
+                return message_figure("No valid columns to plot.")
 
-        # Return as Plotly HTML
-        return ui.HTML(fig.to_html(include_plotlyjs="cdn"))
+        return fig
 
     @output
-    @render.ui
+    @render_widget
     def dist_plot():
-        data = df()
         dist_col = selected_dist_col()
-        if data.empty or not dist_col or dist_col not in data.columns:
-            return ui.div("No column chosen.")
-        if column_type(data[dist_col]) == "numeric":
-            fig = px.histogram(data, x=dist_col)
+        if not known_columns([dist_col]):
+            return message_figure("No column chosen.")
+        ds = dataset([dist_col])
+        data = ds["df"]
+        if data.empty:
+            return message_figure("No column chosen.")
+        large = len(data) > RASTER_ROWS
+        if ds["meta"][dist_col]["type"] == "numeric":
+            fig = binned_histogram(data[dist_col]) if large else px.histogram(data, x=dist_col)
         else:
-            fig = px.bar(data, x=dist_col)
+            fig = counts_bar(data[dist_col]) if large else px.bar(data, x=dist_col)
 
-        return ui.HTML(fig.to_html(include_plotlyjs="cdn"))
+        return fig
 
 app = App(app_ui, server)
\ No newline at end of file
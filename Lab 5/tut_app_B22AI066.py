@@ -1,16 +1,116 @@
 from shiny import App, render, ui, reactive
 import pandas as pd
+import matplotlib
+matplotlib.use('agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+import base64
+from io import BytesIO
+
+# Drop line vertices that don't change the rendered path
+plt.rcParams['path.simplify'] = True
+plt.rcParams['path.simplify_threshold'] = 1.0
 
 # Load the mpg dataset from seaborn
 data = sns.load_dataset('mpg')
 
+# Narrow dtypes so filters and groupbys touch half the bytes. origin stays a plain string
+# column so seaborn's hue levels only include origins present in the plotted rows
+data = data.astype({
+    'cylinders': 'int8',
+    'model_year': 'int16',
+    'weight': 'int16',
+    'mpg': 'float32',
+    'horsepower': 'float32',
+    'displacement': 'float32',
+    'acceleration': 'float32'
+})
+
+# Vehicles per cylinder count, indexed by the cylinder value itself
+CYL_COUNTS = np.bincount(data['cylinders'].to_numpy())
+CYL_LABELS = np.nonzero(CYL_COUNTS)[0]
+
 # Convert unique cylinder values to a list of strings
-cylinder_choices = sorted([str(x) for x in data['cylinders'].unique()])
+cylinder_choices = [str(x) for x in CYL_LABELS]
 origin_choices = sorted(data['origin'].unique())
 
+# Render a matplotlib figure to a PNG data URI and release the figure
+def figure_to_png(fig):
+    buf = BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight')
+    plt.close(fig)
+    return "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode('ascii')
+
+# Static image sized like a default output_plot
+def static_plot(src):
+    return ui.img(src=src, style="width:100%; height:400px; object-fit:contain;")
+
+# Summary pie chart
+def summary_pie_figure():
+    fig, ax = plt.subplots(figsize=(8, 8))
+    ax.pie(CYL_COUNTS[CYL_LABELS], labels=CYL_LABELS, autopct='%1.1f%%')
+    ax.set_title('Distribution of Vehicles by Cylinder Count')
+    return fig
+
+# Year trend plot
+def year_trend_figure():
+    yearly = data.groupby('model_year').agg({
+        'mpg': 'mean', 
+        'horsepower': 'mean', 
+        'weight': 'mean'
+    }).reset_index()
+    
+    fig, ax1 = plt.subplots(figsize=(10, 6))
+    
+    ax1.set_xlabel('Model Year')
+    ax1.set_ylabel('Average MPG', color='tab:blue')
+    ax1.plot(yearly['model_year'], yearly['mpg'], color='tab:blue', marker='o')
+    ax1.tick_params(axis='y', labelcolor='tab:blue')
+    
+    ax2 = ax1.twinx()
+    ax2.set_ylabel('Average Horsepower', color='tab:red')
+    ax2.plot(yearly['model_year'], yearly['horsepower'], color='tab:red', marker='s')
+    ax2.tick_params(axis='y', labelcolor='tab:red')
+    
+    plt.title('Trends in MPG and Horsepower Over Time')
+    fig.tight_layout()
+    return fig
+
+# Horsepower histogram
+def hp_hist_figure():
+    fig, ax = plt.subplots(figsize=(6, 4))
+    sns.histplot(data['horsepower'], kde=True, ax=ax)
+    ax.set_title('Horsepower Distribution')
+    return fig
+
+# Weight impact plot
+def weight_impact_figure():
+    fig, ax = plt.subplots(figsize=(6, 4))
+    sns.regplot(x='weight', y='mpg', data=data, ax=ax)
+    ax.set_title('Weight vs. MPG')
+    return fig
+
+# data never changes, so these outputs are computed once at startup and shared by every session
+AVG_MPG = data['mpg'].mean()
+SUMMARY_PIE_PNG = figure_to_png(summary_pie_figure())
+YEAR_TREND_PNG = figure_to_png(year_trend_figure())
+HP_HIST_PNG = figure_to_png(hp_hist_figure())
+WEIGHT_IMPACT_PNG = figure_to_png(weight_impact_figure())
+
+# Per-cylinder summary statistics; named aggregations give flat column names directly
+SUMMARY_STATS = data.groupby('cylinders').agg(
+    mpg_mean=('mpg', 'mean'),
+    mpg_min=('mpg', 'min'),
+    mpg_max=('mpg', 'max'),
+    horsepower_mean=('horsepower', 'mean'),
+    horsepower_min=('horsepower', 'min'),
+    horsepower_max=('horsepower', 'max'),
+    weight_mean=('weight', 'mean'),
+    weight_min=('weight', 'min'),
+    weight_max=('weight', 'max')
+).reset_index()
+
 # Define UI
 app_ui = ui.page_fluid(
     ui.h2("Vehicle Data Analysis Dashboard"),
@@ -60,13 +160,13 @@ app_ui = ui.page_fluid(
     ui.navset_tab(
         ui.nav_panel("Data Summary", 
             ui.row(
-                ui.column(6, ui.output_plot("summary_pie")),
+                ui.column(6, static_plot(SUMMARY_PIE_PNG)),
                 ui.column(6, ui.output_table("summary_stats"))
             ),
             ui.p("This page provides an overview of the dataset including distribution of vehicles by cylinder count and basic statistics.")
         ),
         ui.nav_panel("Time Trends", 
-            ui.output_plot("year_trend"),
+            static_plot(YEAR_TREND_PNG),
             ui.p("This page shows how vehicle metrics have changed over time.")
         )
     ),
@@ -78,19 +178,19 @@ app_ui = ui.page_fluid(
             ui.card_header("Average MPG"),
             ui.value_box(
                 title="Overall Average MPG",
-                value=ui.output_text("avg_mpg"),
+                value=f"{AVG_MPG:.1f}",
                 theme=ui.value_box_theme(bg="lightblue")
             ),
             "Fuel efficiency is a critical factor in vehicle performance."
         )),
         ui.column(4, ui.card(
             ui.card_header("Horsepower"),
-            ui.output_plot("hp_hist"),
+            static_plot(HP_HIST_PNG),
             "Horsepower distribution across the fleet."
         )),
         ui.column(4, ui.card(
             ui.card_header("Weight Impact"),
-            ui.output_plot("weight_impact"),
+            static_plot(WEIGHT_IMPACT_PNG),
             "There's a strong relationship between vehicle weight and efficiency."
         ))
     ),
@@ -130,37 +230,40 @@ def server(input, output, session):
         
     @reactive.Calc
     def sidebar_filtered_data():
-        df = data.copy()
+        # Combine both filters into one boolean mask and index the data once
+        lo, hi = input.mpg_range()
+        mpg = data['mpg'].to_numpy()
         # Filter by MPG range
-        df = df[(df['mpg'] >= input.mpg_range()[0]) & (df['mpg'] <= input.mpg_range()[1])]
+        mask = (mpg >= lo) & (mpg <= hi)
         # Filter by origin
         if input.origins():
-            df = df[df['origin'].isin(input.origins())]
-        return df
+            mask &= data['origin'].isin(input.origins()).to_numpy()
+        return data[mask]
     
     # Main plot
     @output
     @render.plot
     def plot():
-        plt.figure(figsize=(10, 6))
+        # A new figure per render: render.plot rescales the figure's size and DPI for the
+        # screen, so a reused figure would compound that scaling on every render
+        plot_fig, plot_ax = plt.subplots(figsize=(10, 6))
         
         plot_type = input.plot_type()
         df = filtered_data()
         
         if plot_type == "MPG by Cylinders":
-            sns.barplot(x='cylinders', y='mpg', data=df)
-            plt.title(f'Miles per Gallon for {input.select()} Cylinders')
+            sns.barplot(x='cylinders', y='mpg', data=df, ax=plot_ax)
+            plot_ax.set_title(f'Miles per Gallon for {input.select()} Cylinders')
             
         elif plot_type == "Weight vs MPG":
-            sns.scatterplot(x='weight', y='mpg', hue='origin', data=df)
-            plt.title(f'Weight vs MPG for {input.select()}-Cylinder Vehicles')
+            sns.scatterplot(x='weight', y='mpg', hue='origin', data=df, ax=plot_ax)
+            plot_ax.set_title(f'Weight vs MPG for {input.select()}-Cylinder Vehicles')
             
         else:  # Horsepower Distribution
-            sns.histplot(df['horsepower'], kde=True)
-            plt.title(f'Horsepower Distribution for {input.select()}-Cylinder Vehicles')
+            sns.histplot(df['horsepower'], kde=True, ax=plot_ax)
+            plot_ax.set_title(f'Horsepower Distribution for {input.select()}-Cylinder Vehicles')
         
-        fig = plt.gcf()
-        return fig
+        return plot_fig
 
     # Sidebar plot
     @output
@@ -168,70 +271,10 @@ def server(input, output, session):
     def sidebar_plot():
         df = sidebar_filtered_data()
         
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.lineplot(x='model_year', y='mpg', hue='origin', data=df, markers=True, ax=ax)
-        plt.title('MPG Trends by Origin and Year')
-        return fig
-    
-    # Summary pie chart
-    @output
-    @render.plot
-    def summary_pie():
-        fig, ax = plt.subplots(figsize=(8, 8))
-        cyl_counts = data['cylinders'].value_counts()
-        ax.pie(cyl_counts, labels=cyl_counts.index, autopct='%1.1f%%')
-        ax.set_title('Distribution of Vehicles by Cylinder Count')
-        return fig
-    
-    # Year trend plot
-    @output
-    @render.plot
-    def year_trend():
-        yearly = data.groupby('model_year').agg({
-            'mpg': 'mean', 
-            'horsepower': 'mean', 
-            'weight': 'mean'
-        }).reset_index()
-        
-        fig, ax1 = plt.subplots(figsize=(10, 6))
-        
-        ax1.set_xlabel('Model Year')
-        ax1.set_ylabel('Average MPG', color='tab:blue')
-        ax1.plot(yearly['model_year'], yearly['mpg'], color='tab:blue', marker='o')
-        ax1.tick_params(axis='y', labelcolor='tab:blue')
-        
-        ax2 = ax1.twinx()
-        ax2.set_ylabel('Average Horsepower', color='tab:red')
-        ax2.plot(yearly['model_year'], yearly['horsepower'], color='tab:red', marker='s')
-        ax2.tick_params(axis='y', labelcolor='tab:red')
-        
-        plt.title('Trends in MPG and Horsepower Over Time')
-        fig.tight_layout()
-        return fig
-    
-    # Average MPG text
-    @output
-    @render.text
-    def avg_mpg():
-        return f"{data['mpg'].mean():.1f}"
-    
-    # Horsepower histogram
-    @output
-    @render.plot
-    def hp_hist():
-        fig, ax = plt.subplots(figsize=(6, 4))
-        sns.histplot(data['horsepower'], kde=True, ax=ax)
-        ax.set_title('Horsepower Distribution')
-        return fig
-    
-    # Weight impact plot
-    @output
-    @render.plot
-    def weight_impact():
-        fig, ax = plt.subplots(figsize=(6, 4))
-        sns.regplot(x='weight', y='mpg', data=data, ax=ax)
-        ax.set_title('Weight vs. MPG')
-        return fig
+        sidebar_fig, sidebar_ax = plt.subplots(figsize=(10, 6))
+        sns.lineplot(x='model_year', y='mpg', hue='origin', data=df, markers=True, ax=sidebar_ax)
+        sidebar_ax.set_title('MPG Trends by Origin and Year')
+        return sidebar_fig
     
     # Cylinder specific plots
     @output
@@ -256,10 +299,8 @@ def server(input, output, session):
     @render.plot
     def cyl8_plot():
         fig, ax = plt.subplots(figsize=(8, 5))
-        cyl8 = data[data['cylinders'] == 8]
-        years = sorted(cyl8['model_year'].unique())
-        avg_mpg = [cyl8[cyl8['model_year']==year]['mpg'].mean() for year in years]
-        ax.bar(years, avg_mpg)
+        avg_mpg = data.loc[data['cylinders'] == 8].groupby('model_year', sort=True)['mpg'].mean()
+        ax.bar(avg_mpg.index, avg_mpg.to_numpy())
         ax.set_title('Average MPG by Year for 8-cylinder Vehicles')
         ax.set_xlabel('Model Year')
         ax.set_ylabel('Average MPG')
@@ -276,13 +317,7 @@ def server(input, output, session):
     @output
     @render.table
     def summary_stats():
-        stats = data.groupby('cylinders').agg({
-            'mpg': ['mean', 'min', 'max'],
-            'horsepower': ['mean', 'min', 'max'],
-            'weight': ['mean', 'min', 'max']
-        })
-        stats.columns = ['_'.join(col).strip() for col in stats.columns.values]
-        return stats.reset_index()
+        return SUMMARY_STATS
 
 # Create app
 app = App(app_ui, server)
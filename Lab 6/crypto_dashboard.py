@@ -1,23 +1,123 @@
 import dash
-from dash import dcc, html, Input, Output
+from dash import dcc, html, Input, Output, State, Patch
 import dash_bootstrap_components as dbc
-import plotly.graph_objs as go
+import plotly.io as pio
+from plotly.subplots import make_subplots
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import threading
+import functools
+import base64
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from indicators import compute_all
+
+try:
+    import numbagg
+except ImportError:
+    numbagg = None
+
+try:
+    from tsdownsample import MinMaxLTTBDownsampler
+except ImportError:
+    MinMaxLTTBDownsampler = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Initialize Dash app with Bootstrap theme
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
 app.title = 'Cryptocurrency Dashboard'
 
+# Upper bound on points per trace sent to the browser
+MAX_POINTS = 2000
+
+# Figures are returned to Dash as plain dicts, which skips plotly's per-property validation.
+# Plotly.js can't resolve a template by name, so plotly_white is converted to a dict once
+# and shared by every chart's layout. BASE_LAYOUT is only ever spread into a layout, so its
+# keys are read-only; the template dict inside it (and LEGEND, which the JSON encoders need as
+# a real dict) is still shared by reference by every cached figure and must not be modified
+BASE_LAYOUT = MappingProxyType({'template': pio.templates['plotly_white'].to_plotly_json()})
+
+# Horizontal legend centred above the plot area
+LEGEND = {'orientation': 'h', 'yanchor': 'bottom', 'y': 1.02, 'xanchor': 'center', 'x': 0.5}
+
+# Axes of the stacked price/volume/RSI/MACD chart: four rows matched to the bottom row's x axis
+STACK_AXES = {
+    name: axis for name, axis in make_subplots(
+        rows=4, cols=1, shared_xaxes=True, vertical_spacing=0.03, row_heights=[0.4, 0.2, 0.2, 0.2]
+    ).layout.to_plotly_json().items() if name != 'template'
+}
+
+# Dash serializes callback outputs through plotly's JSON engine; orjson encodes the
+# NumPy trace arrays in C instead of converting them to Python lists first
+if orjson is not None:
+    pio.json.config.default_engine = 'orjson'
+
+# Initial dropdown/radio selections
+DEFAULT_SYMBOL = 'bitcoin'
+DEFAULT_RANGE = '30'
+
+# API responses are reused for CACHE_TTL seconds; CoinGecko only refreshes every few minutes
+CACHE_TTL = 300
+_api_cache = TTLCache(maxsize=128, ttl=CACHE_TTL)
+_api_cache_lock = threading.Lock()
+
+def cache_lookup(key):
+    with _api_cache_lock:
+        return _api_cache.get(key)
+
+# Only successful results are stored so a failed request is retried on the next callback
+def cache_store(key, value):
+    with _api_cache_lock:
+        _api_cache[key] = value
+    return value
+
+# One pooled keep-alive session so callbacks reuse the TCP/TLS connection to CoinGecko
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504), raise_on_status=False)
+))
+_etags = {}
+
+# GET a JSON endpoint, reusing the previous body when the server answers 304 Not Modified
+def get_json(url):
+    headers = {}
+    if url in _etags:
+        headers['If-None-Match'] = _etags[url][0]
+    try:
+        r = _session.get(url, headers=headers, timeout=(3, 10))
+    except requests.RequestException as e:
+        print("Request to", url, "failed:", e)
+        return 0, {}
+    if r.status_code == 304 and url in _etags:
+        return 200, _etags[url][1]
+    
+    json_data = r.json() if r.status_code == 200 else {}
+    if r.status_code == 200 and 'ETag' in r.headers:
+        _etags[url] = (r.headers['ETag'], json_data)
+    return r.status_code, json_data
+
 # Fetch global market data
 def fetch_global_data():
+    cached = cache_lookup(('global',))
+    if cached is not None:
+        return cached
+    
     url = "https://api.coingecko.com/api/v3/global"
-    r = requests.get(url)
-    if r.status_code != 200:
+    status, json_data = get_json(url)
+    if status != 200:
         return 0, 0, 0  # or handle differently
     
-    json_data = r.json()
     if "data" not in json_data:
         return 0, 0, 0  # or handle differently
     
@@ -25,63 +125,109 @@ def fetch_global_data():
     total_market_cap = data["total_market_cap"]["usd"]
     total_24h_volume = data["total_volume"]["usd"]
     btc_dominance = data["market_cap_percentage"]["btc"]
-    return total_market_cap, total_24h_volume, btc_dominance
+    return cache_store(('global',), (total_market_cap, total_24h_volume, btc_dominance))
+
+# Simple moving average over a fixed window; NaN until the window is full
+def moving_average(values, window):
+    out = np.full(len(values), np.nan)
+    if len(values) < window:
+        return out
+    if numbagg is not None:
+        return numbagg.move_mean(values, window=window, min_count=window)
+    out[window - 1:] = sliding_window_view(values, window).mean(axis=-1)
+    return out
 
 # Fetch cryptocurrency data
 def fetch_crypto_data(symbol, currency='USD', days=30):
+    key = ('market_chart', symbol, currency, days)
+    cached = cache_lookup(key)
+    if cached is not None:
+        return cached
+    
     url = f'https://api.coingecko.com/api/v3/coins/{symbol}/market_chart?vs_currency={currency}&days={days}&interval=daily'
-    response = requests.get(url)
-    data = response.json()
+    status, data = get_json(url)
     
     # Check if the needed keys exist
     if 'prices' not in data or 'total_volumes' not in data:
-        print("API response is missing 'prices' or 'total_volumes'. Response data:", data)
+        print("API response is missing 'prices' or 'total_volumes'. Status:", status, "Response data:", data)
         return pd.DataFrame(), pd.DataFrame()  # return empty frames or handle differently
     
-    df = pd.DataFrame(data['prices'], columns=['timestamp', 'price'])
-    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-    
-    df_volume = pd.DataFrame(data['total_volumes'], columns=['timestamp', 'volume'])
-    df_volume['timestamp'] = pd.to_datetime(df_volume['timestamp'], unit='ms')
+    prices = np.asarray(data['prices'], dtype=float).reshape(-1, 2)
+    volumes = np.asarray(data['total_volumes'], dtype=float).reshape(-1, 2)
+    price = prices[:, 1]
     
-    # Standard moving averages
-    df['7-day MA'] = df['price'].rolling(7).mean()
-    df['30-day MA'] = df['price'].rolling(30).mean()
-    df['Price Change %'] = df['price'].pct_change() * 100
+    # Returns, Bollinger Bands, RSI (14-day) and MACD
+    ma, upper, lower, rsi, macd, signal, hist, cumulative_return, pct_change = compute_all(price)
     
-    # Calculate Bollinger Bands
-    df['20-day MA'] = df['price'].rolling(20).mean()
-    df['Std Dev'] = df['price'].rolling(20).std()
-    df['Upper Band'] = df['20-day MA'] + (df['Std Dev'] * 2)
-    df['Lower Band'] = df['20-day MA'] - (df['Std Dev'] * 2)
+    # Assemble the frames once from the computed arrays. Only the columns the charts read are
+    # kept, downcast to float32, which halves the cached frames and is finer than a chart can show
+    columns = {
+        'price': price,
+        '7-day MA': moving_average(price, 7),
+        '30-day MA': moving_average(price, 30),
+        'Price Change %': pct_change,
+        '20-day MA': ma,
+        'Upper Band': upper,
+        'Lower Band': lower,
+        'RSI': rsi,
+        'MACD': macd,
+        'Signal Line': signal,
+        'MACD Histogram': hist,
+        'Cumulative Return': cumulative_return
+    }
+    df = pd.DataFrame({
+        'timestamp': pd.to_datetime(prices[:, 0].astype('int64'), unit='ms'),
+        **{name: values.astype(np.float32) for name, values in columns.items()}
+    })
+    df_volume = pd.DataFrame({
+        'timestamp': pd.to_datetime(volumes[:, 0].astype('int64'), unit='ms'),
+        'volume': volumes[:, 1].astype(np.float32)
+    })
     
-    # Calculate RSI (14-day)
-    delta = df['price'].diff()
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
-    avg_gain = gain.rolling(window=14).mean()
-    avg_loss = loss.rolling(window=14).mean()
-    rs = avg_gain / avg_loss
-    df['RSI'] = 100 - (100 / (1 + rs))
-    
-    # Calculate MACD
-    df['12-day EMA'] = df['price'].ewm(span=12, adjust=False).mean()
-    df['26-day EMA'] = df['price'].ewm(span=26, adjust=False).mean()
-    df['MACD'] = df['12-day EMA'] - df['26-day EMA']
-    df['Signal Line'] = df['MACD'].ewm(span=9, adjust=False).mean()
-    df['MACD Histogram'] = df['MACD'] - df['Signal Line']
-    
-    # Calculate Daily Return and Cumulative Return
-    df['Daily Return'] = df['price'].pct_change()
-    df['Cumulative Return'] = (1 + df['Daily Return']).cumprod() - 1
-    
-    return df, df_volume
+    return cache_store(key, (df, df_volume))
+
+# Downsample a frame to at most n_out rows with MinMaxLTTB on col (or each bucket's min and
+# max without tsdownsample); every column is indexed with the same rows
+def downsample_minmax(df, col, n_out=MAX_POINTS):
+    if len(df) <= n_out:
+        return df
+    y = df[col].to_numpy()
+    if MinMaxLTTBDownsampler is not None:
+        x = df['timestamp'].to_numpy().astype('int64')
+        return df.iloc[MinMaxLTTBDownsampler().downsample(x, y, n_out=n_out)]
+    # One bucket is left for the two endpoints, so at most n_out rows are kept
+    edges = np.linspace(0, len(y), n_out // 2).astype(int)
+    idx = [0, len(y) - 1]
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        idx.append(lo + np.argmin(y[lo:hi]))
+        idx.append(lo + np.argmax(y[lo:hi]))
+    return df.iloc[np.unique(idx)]
+
+# Downsample a frame to at most n_out rows with M4: the first, last, min and max rows of col
+# in each of n_out // 4 buckets, so spikes survive and every bar is a real observation
+def downsample_m4(df, col, n_out=MAX_POINTS):
+    if len(df) <= n_out:
+        return df
+    y = df[col].to_numpy()
+    edges = np.linspace(0, len(y), n_out // 4 + 1).astype(int)
+    idx = [edges[:-1], edges[1:] - 1]
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        idx.append([lo + np.argmin(y[lo:hi]), lo + np.argmax(y[lo:hi])])
+    return df.iloc[np.unique(np.concatenate(idx))]
+
+# Warm the cache for the initial chart request in the background. The worker is not
+# joined here: it may need the import lock this module holds while loading.
+_prefetch = ThreadPoolExecutor(max_workers=1)
+_prefetch.submit(fetch_crypto_data, DEFAULT_SYMBOL, days=int(DEFAULT_RANGE))
 
 # Fetch global market overview data once
 global_total_market_cap, global_24h_volume, btc_dominance = fetch_global_data()
 
 # Layout with collapsible left panel, global overview, and multi-column chart layout
 app.layout = html.Div([
+    # Current chart selection; the chart callbacks read their data from the server-side cache
+    dcc.Store(id='indicator-cache'),
+    
     # Header
     html.Div(
         html.H1("Cryptocurrency Dashboard", style={'textAlign': 'center', 'color': '#ffffff'}),
@@ -141,7 +287,7 @@ app.layout = html.Div([
                             {'label': 'Cardano', 'value': 'cardano'},
                             {'label': 'Solana', 'value': 'solana'}
                         ],
-                        value='bitcoin',
+                        value=DEFAULT_SYMBOL,
                         style={'marginBottom': '20px'}
                     ),
                     
@@ -156,7 +302,7 @@ app.layout = html.Div([
                             {'label': '180 Days', 'value': '180'},
                             {'label': '365 Days', 'value': '365'}
                         ],
-                        value='30',
+                        value=DEFAULT_RANGE,
                         labelStyle={'display': 'block', 'margin': '10px 0'}
                     ),
                     
@@ -178,27 +324,21 @@ app.layout = html.Div([
         
         # Charts in multi-column layout (rearranged)
         dbc.Col([
-            # Row 1: Price Change + MACD
-            dbc.Row([
-                dbc.Col(dcc.Graph(id='crypto-price-change-chart', style={'boxShadow': '0 4px 8px rgba(0,0,0,0.2)'}), width=6),
-                dbc.Col(dcc.Graph(id='macd-chart', style={'boxShadow': '0 4px 8px rgba(0,0,0,0.2)'}), width=6)
-            ], style={'marginBottom': '20px'}),
-            # Row 2: Price + Volume
+            # Row 1: Price, Volume, RSI and MACD on a shared date axis
             dbc.Row([
-                dbc.Col(dcc.Graph(id='crypto-price-chart', style={'boxShadow': '0 4px 8px rgba(0,0,0,0.2)'}), width=6),
-                dbc.Col(dcc.Graph(id='crypto-volume-chart', style={'boxShadow': '0 4px 8px rgba(0,0,0,0.2)'}), width=6)
+                dbc.Col(dcc.Graph(id='market-stack-chart', style={'height': '900px', 'boxShadow': '0 4px 8px rgba(0,0,0,0.2)'}), width=12)
             ], style={'marginBottom': '20px'}),
-            # Row 3: Moving Average + Comparison
+            # Row 2: Price Change + Moving Average
             dbc.Row([
-                dbc.Col(dcc.Graph(id='crypto-moving-average-chart', style={'boxShadow': '0 4px 8px rgba(0,0,0,0.2)'}), width=6),
-                dbc.Col(dcc.Graph(id='crypto-comparison-chart', style={'boxShadow': '0 4px 8px rgba(0,0,0,0.2)'}), width=6)
+                dbc.Col(dcc.Graph(id='crypto-price-change-chart', style={'boxShadow': '0 4px 8px rgba(0,0,0,0.2)'}), width=6),
+                dbc.Col(dcc.Graph(id='crypto-moving-average-chart', style={'boxShadow': '0 4px 8px rgba(0,0,0,0.2)'}), width=6)
             ], style={'marginBottom': '20px'}),
-            # Row 4: Bollinger + RSI
+            # Row 3: Comparison + Bollinger
             dbc.Row([
-                dbc.Col(dcc.Graph(id='bollinger-bands-chart', style={'boxShadow': '0 4px 8px rgba(0,0,0,0.2)'}), width=6),
-                dbc.Col(dcc.Graph(id='rsi-chart', style={'boxShadow': '0 4px 8px rgba(0,0,0,0.2)'}), width=6)
+                dbc.Col(dcc.Graph(id='crypto-comparison-chart', style={'boxShadow': '0 4px 8px rgba(0,0,0,0.2)'}), width=6),
+                dbc.Col(dcc.Graph(id='bollinger-bands-chart', style={'boxShadow': '0 4px 8px rgba(0,0,0,0.2)'}), width=6)
             ], style={'marginBottom': '20px'}),
-            # Row 5: Cumulative Return
+            # Row 4: Cumulative Return
             dbc.Row([
                 dbc.Col(dcc.Graph(id='cumulative-return-chart', style={'boxShadow': '0 4px 8px rgba(0,0,0,0.2)'}), width=6)
             ])
@@ -217,173 +357,346 @@ def toggle_collapse(n_clicks, is_open):
         return not is_open
     return is_open
 
-# Callback to update cryptocurrency charts
+# Fingerprint of a fetched frame; it changes once the API data is refetched. The last
+# timestamp is in ms so the fingerprint survives the JSON round trip through the browser
+def data_fingerprint(df):
+    return (len(df), int(df['timestamp'].iloc[-1].value // 10**6)) if len(df) else None
+
+# Downsampled price/indicator and volume frames for one chart request. All the charts
+# read the same frames, so they are cached alongside the API data they came from
+def load_chart_data(symbol, time_range):
+    df, df_volume = fetch_crypto_data(symbol, days=int(time_range))
+    fingerprint = data_fingerprint(df)
+    key = ('chart_data', symbol, time_range, fingerprint)
+    cached = cache_lookup(key)
+    if cached is not None:
+        return cached
+    
+    # Bound the number of points per trace regardless of the time range
+    frames = downsample_minmax(df, 'price'), downsample_m4(df_volume, 'volume')
+    return frames if fingerprint is None else cache_store(key, frames)
+
+# Timestamps as epoch milliseconds; a date axis reads the numbers directly, which is cheaper
+# to serialize and to send than ISO date strings
+def epoch_ms(timestamps):
+    return timestamps.to_numpy(dtype='datetime64[ms]').view('int64')
+
+# Trace data as a plotly.js typed array: the raw buffer in base64 instead of a JSON list
+# of numbers. Millisecond timestamps don't fit in int32, so integers are sent as float64
+def typed_array(values):
+    if values.dtype.kind in 'iu':
+        values, dtype = np.ascontiguousarray(values, dtype=np.float64), 'f8'
+    else:
+        values, dtype = np.ascontiguousarray(values, dtype=np.float32), 'f4'
+    return {'dtype': dtype, 'bdata': base64.b64encode(values).decode('ascii')}
+
+# Price Chart
+def price_figure(df, df_volume, symbol, time_range):
+    ts = epoch_ms(df['timestamp'])
+    return {
+        'data': [{'type': 'scattergl', 'x': ts, 'y': df['price'].to_numpy(), 'mode': 'lines', 'name': 'Price'}],
+        'layout': {
+            **BASE_LAYOUT,
+            'uirevision': symbol,
+            'title': {'text': f'{symbol.capitalize()} Price Trend ({time_range} Days)'},
+            'xaxis': {'title': {'text': 'Date'}, 'type': 'date'},
+            'yaxis': {'title': {'text': 'Price (USD)'}}
+        }
+    }
+
+# Volume Chart
+def volume_figure(df, df_volume, symbol, time_range):
+    return {
+        'data': [{'type': 'bar', 'x': epoch_ms(df_volume['timestamp']), 'y': df_volume['volume'].to_numpy(), 'name': 'Volume', 'marker': {'color': 'blue'}}],
+        'layout': {
+            **BASE_LAYOUT,
+            'uirevision': symbol,
+            'title': {'text': f'{symbol.capitalize()} Trading Volume ({time_range} Days)'},
+            'xaxis': {'title': {'text': 'Date'}, 'type': 'date'},
+            'yaxis': {'title': {'text': 'Volume'}}
+        }
+    }
+
+# Moving Average Chart
+def moving_average_figure(df, df_volume, symbol, time_range):
+    ts = epoch_ms(df['timestamp'])
+    return {
+        'data': [
+            {'type': 'scattergl', 'x': ts, 'y': df['price'].to_numpy(), 'mode': 'lines', 'name': 'Price'},
+            {'type': 'scattergl', 'x': ts, 'y': df['7-day MA'].to_numpy(), 'mode': 'lines', 'name': '7-day MA', 'line': {'dash': 'dash', 'color': 'red'}},
+            {'type': 'scattergl', 'x': ts, 'y': df['30-day MA'].to_numpy(), 'mode': 'lines', 'name': '30-day MA', 'line': {'dash': 'dot', 'color': 'green'}}
+        ],
+        'layout': {
+            **BASE_LAYOUT,
+            'uirevision': symbol,
+            'title': {'text': f'{symbol.capitalize()} Moving Averages ({time_range} Days)'},
+            'xaxis': {'title': {'text': 'Date'}, 'type': 'date'},
+            'yaxis': {'title': {'text': 'Price (USD)'}}
+        }
+    }
+
+# Price vs Volume Comparison Chart
+def comparison_figure(df, df_volume, symbol, time_range):
+    ts = epoch_ms(df['timestamp'])
+    return {
+        'data': [
+            {'type': 'scattergl', 'x': ts, 'y': df['price'].to_numpy(), 'mode': 'lines', 'name': 'Price', 'yaxis': 'y'},
+            {'type': 'bar', 'x': epoch_ms(df_volume['timestamp']), 'y': df_volume['volume'].to_numpy(), 'name': 'Volume', 'marker': {'color': 'blue'}, 'yaxis': 'y2', 'opacity': 0.7}
+        ],
+        'layout': {
+            **BASE_LAYOUT,
+            'uirevision': symbol,
+            'title': {'text': f'{symbol.capitalize()} Price vs Volume ({time_range} Days)'},
+            'xaxis': {'title': {'text': 'Date'}, 'type': 'date'},
+            'yaxis': {'title': {'text': 'Price (USD)'}, 'side': 'left'},
+            'yaxis2': {'title': {'text': 'Volume'}, 'side': 'right', 'overlaying': 'y'},
+            'legend': LEGEND
+        }
+    }
+
+# Bars split by sign into an up and a down trace, each with one fixed colour, so no
+# per-bar colour array is sent. The x values never overlap, so the traces are overlaid
+def sign_bar_traces(ts, values, names, colors):
+    up = values >= 0
+    return [
+        {'type': 'bar', 'x': ts[up], 'y': values[up], 'name': names[0], 'marker': {'color': colors[0]}},
+        {'type': 'bar', 'x': ts[~up], 'y': values[~up], 'name': names[1], 'marker': {'color': colors[1]}}
+    ]
+
+# Price Change Percentage Chart
+def price_change_figure(df, df_volume, symbol, time_range):
+    ts = epoch_ms(df['timestamp'])
+    return {
+        'data': sign_bar_traces(ts, df['Price Change %'].to_numpy(), ('Up', 'Down'), ('green', 'red')),
+        'layout': {
+            **BASE_LAYOUT,
+            'uirevision': symbol,
+            'title': {'text': f'{symbol.capitalize()} Daily Price Change (%) ({time_range} Days)'},
+            'xaxis': {'title': {'text': 'Date'}, 'type': 'date'},
+            'yaxis': {'title': {'text': 'Percentage Change'}},
+            'barmode': 'overlay'
+        }
+    }
+
+# Bollinger Bands Chart
+def bollinger_figure(df, df_volume, symbol, time_range):
+    ts = epoch_ms(df['timestamp'])
+    # The band is one closed polygon: along the upper band, then back along the lower band.
+    # Rows before the 20-day window fills have no band and would break the outline
+    has_band = ~np.isnan(df['Upper Band'].to_numpy())
+    band_ts = ts[has_band]
+    return {
+        'data': [
+            {
+                'type': 'scattergl',
+                'x': np.concatenate([band_ts, band_ts[::-1]]),
+                'y': np.concatenate([df['Upper Band'].to_numpy()[has_band], df['Lower Band'].to_numpy()[has_band][::-1]]),
+                'mode': 'lines',
+                'name': 'Bollinger Bands',
+                'line': {'width': 1, 'color': 'rgba(173, 204, 255, 0.7)'},
+                'fill': 'toself',
+                'fillcolor': 'rgba(173, 204, 255, 0.2)',
+                'hoverinfo': 'skip',
+                'showlegend': True
+            },
+            {'type': 'scattergl', 'x': ts, 'y': df['20-day MA'].to_numpy(), 'mode': 'lines', 'name': '20-day MA', 'line': {'width': 2, 'color': 'rgba(44, 130, 201, 1)'}},
+            {'type': 'scattergl', 'x': ts, 'y': df['price'].to_numpy(), 'mode': 'lines', 'name': 'Price', 'line': {'width': 2, 'color': 'black'}}
+        ],
+        'layout': {
+            **BASE_LAYOUT,
+            'uirevision': symbol,
+            'title': {'text': f'{symbol.capitalize()} Bollinger Bands ({time_range} Days)'},
+            'xaxis': {'title': {'text': 'Date'}, 'type': 'date'},
+            'yaxis': {'title': {'text': 'Price (USD)'}},
+            'legend': LEGEND
+        }
+    }
+
+# RSI Chart
+def rsi_figure(df, df_volume, symbol, time_range):
+    ts = epoch_ms(df['timestamp'])
+    # Timestamps are sorted, so the ends give the reference line span without a scan
+    t_min, t_max = int(ts[0]), int(ts[-1])
+    return {
+        'data': [{'type': 'scattergl', 'x': ts, 'y': df['RSI'].to_numpy(), 'mode': 'lines', 'name': 'RSI', 'line': {'color': 'purple', 'width': 2}}],
+        'layout': {
+            **BASE_LAYOUT,
+            'uirevision': symbol,
+            'title': {'text': f'{symbol.capitalize()} RSI (14-day) ({time_range} Days)'},
+            'xaxis': {'title': {'text': 'Date'}, 'type': 'date'},
+            'yaxis': {'title': {'text': 'RSI'}, 'range': [0, 100]},
+            # Overbought/oversold reference lines
+            'shapes': [
+                {'type': 'line', 'x0': t_min, 'x1': t_max, 'y0': 70, 'y1': 70, 'line': {'color': 'red', 'dash': 'dash'}},
+                {'type': 'line', 'x0': t_min, 'x1': t_max, 'y0': 30, 'y1': 30, 'line': {'color': 'green', 'dash': 'dash'}}
+            ],
+            'annotations': [
+                {'x': t_max, 'y': 70, 'text': "Overbought", 'showarrow': False, 'xshift': 10},
+                {'x': t_max, 'y': 30, 'text': "Oversold", 'showarrow': False, 'xshift': 10}
+            ]
+        }
+    }
+
+# MACD Chart
+def macd_figure(df, df_volume, symbol, time_range):
+    ts = epoch_ms(df['timestamp'])
+    histogram = sign_bar_traces(ts, df['MACD Histogram'].to_numpy(), ('Histogram Up', 'Histogram Down'), ('rgba(0, 153, 0, 0.7)', 'rgba(255, 51, 51, 0.7)'))
+    return {
+        'data': [
+            *histogram,
+            {'type': 'scattergl', 'x': ts, 'y': df['MACD'].to_numpy(), 'mode': 'lines', 'name': 'MACD', 'line': {'color': 'blue', 'width': 2}},
+            {'type': 'scattergl', 'x': ts, 'y': df['Signal Line'].to_numpy(), 'mode': 'lines', 'name': 'Signal', 'line': {'color': 'red', 'width': 1.5}}
+        ],
+        'layout': {
+            **BASE_LAYOUT,
+            'uirevision': symbol,
+            'title': {'text': f'{symbol.capitalize()} MACD ({time_range} Days)'},
+            'xaxis': {'title': {'text': 'Date'}, 'type': 'date'},
+            'yaxis': {'title': {'text': 'MACD'}},
+            'barmode': 'overlay',
+            'legend': LEGEND
+        }
+    }
+
+# Cumulative Return Chart
+def cumulative_return_figure(df, df_volume, symbol, time_range):
+    ts = epoch_ms(df['timestamp'])
+    return {
+        'data': [{
+            'type': 'scattergl',
+            'x': ts,
+            'y': df['Cumulative Return'].to_numpy() * 100,
+            'mode': 'lines',
+            'name': 'Cumulative Return',
+            'line': {'color': 'darkblue', 'width': 2},
+            'fill': 'tozeroy',
+            'fillcolor': 'rgba(0, 0, 255, 0.1)'
+        }],
+        'layout': {
+            **BASE_LAYOUT,
+            'uirevision': symbol,
+            'title': {'text': f'{symbol.capitalize()} Cumulative Return ({time_range} Days)'},
+            'xaxis': {'title': {'text': 'Date'}, 'type': 'date'},
+            'yaxis': {'title': {'text': 'Cumulative Return (%)'}}
+        }
+    }
+
+# Price, volume, RSI and MACD stacked on one shared date axis, so the rows share a single
+# plot (and WebGL context) and zooming one row zooms them all
+def market_stack_figure(df, df_volume, symbol, time_range):
+    rows = [build(df, df_volume, symbol, time_range) for build in (price_figure, volume_figure, rsi_figure, macd_figure)]
+    data = []
+    layout = {
+        **BASE_LAYOUT,
+        'uirevision': symbol,
+        'title': {'text': f'{symbol.capitalize()} Price, Volume, RSI and MACD ({time_range} Days)'},
+        'barmode': 'overlay',
+        'legend': LEGEND
+    }
+    for row, fig in enumerate(rows, start=1):
+        suffix = '' if row == 1 else str(row)
+        data += [{**trace, 'xaxis': 'x' + suffix, 'yaxis': 'y' + suffix} for trace in fig['data']]
+        layout['xaxis' + suffix] = {**STACK_AXES['xaxis' + suffix], 'type': 'date'}
+        layout['yaxis' + suffix] = {**STACK_AXES['yaxis' + suffix], **fig['layout']['yaxis']}
+    layout['xaxis4']['title'] = {'text': 'Date'}
+    # RSI reference lines and labels belong to the third row
+    rsi_layout = rows[2]['layout']
+    layout['shapes'] = [{**shape, 'xref': 'x3', 'yref': 'y3'} for shape in rsi_layout['shapes']]
+    layout['annotations'] = [{**note, 'xref': 'x3', 'yref': 'y3'} for note in rsi_layout['annotations']]
+    return {'data': data, 'layout': layout}
+
+# Graph id -> figure builder; each chart gets its own callback
+CHART_BUILDERS = {
+    'market-stack-chart': market_stack_figure,
+    'crypto-moving-average-chart': moving_average_figure,
+    'crypto-comparison-chart': comparison_figure,
+    'crypto-price-change-chart': price_change_figure,
+    'bollinger-bands-chart': bollinger_figure,
+    'cumulative-return-chart': cumulative_return_figure
+}
+
+# Patch that swaps in a rebuilt figure's trace data and titles, leaving the rest of
+# the figure already in the browser (template, styling, colours) untouched
+def figure_patch(fig):
+    patch = Patch()
+    for i, trace in enumerate(fig['data']):
+        patch['data'][i]['x'] = trace['x']
+        patch['data'][i]['y'] = trace['y']
+    layout = fig['layout']
+    patch['layout']['title']['text'] = layout['title']['text']
+    # Layouts set uirevision to the symbol: zoom/pan is kept across time range changes and
+    # reset when a different coin is selected
+    patch['layout']['uirevision'] = layout['uirevision']
+    if 'shapes' in layout:
+        patch['layout']['shapes'] = layout['shapes']
+    if 'annotations' in layout:
+        patch['layout']['annotations'] = layout['annotations']
+    return patch
+
+# Fingerprint of the cached API data for a selection
+def chart_data_key(symbol, time_range):
+    df, _ = fetch_crypto_data(symbol, days=int(time_range))
+    return data_fingerprint(df)
+
+# Built figures are reused across callbacks until the data behind them changes
+@functools.lru_cache(maxsize=64)
+def chart_figure(graph_id, symbol, time_range, data_key):
+    df, df_volume = load_chart_data(symbol, time_range)
+    fig = CHART_BUILDERS[graph_id](df, df_volume, symbol, time_range)
+    # Encoded once per cached figure; full figures and patches both send the typed arrays
+    for trace in fig['data']:
+        trace['x'] = typed_array(trace['x'])
+        trace['y'] = typed_array(trace['y'])
+    return fig
+
+# Workers that build a selection's figures side by side
+_figure_pool = ThreadPoolExecutor(max_workers=4)
+
+# Callback to fetch the selected chart data once and signal the chart callbacks
 @app.callback(
-    [Output('crypto-price-chart', 'figure'), 
-     Output('crypto-volume-chart', 'figure'), 
-     Output('crypto-moving-average-chart', 'figure'), 
-     Output('crypto-comparison-chart', 'figure'), 
-     Output('crypto-price-change-chart', 'figure'),
-     Output('bollinger-bands-chart', 'figure'),
-     Output('rsi-chart', 'figure'),
-     Output('macd-chart', 'figure'),
-     Output('cumulative-return-chart', 'figure')],
+    Output('indicator-cache', 'data'),
     [Input('crypto-symbol', 'value'),
-     Input('time-range', 'value')]
+     Input('time-range', 'value')],
+    State('indicator-cache', 'data')
 )
-def update_crypto_charts(symbol, time_range):
-    df, df_volume = fetch_crypto_data(symbol, days=int(time_range))
-    
-    # Price Chart
-    price_fig = go.Figure()
-    price_fig.add_trace(go.Scatter(x=df['timestamp'], y=df['price'], mode='lines', name='Price'))
-    price_fig.update_layout(
-        title=f'{symbol.capitalize()} Price Trend ({time_range} Days)', 
-        xaxis_title='Date', 
-        yaxis_title='Price (USD)',
-        template='plotly_white'
-    )
-    
-    # Volume Chart
-    volume_fig = go.Figure()
-    volume_fig.add_trace(go.Bar(x=df_volume['timestamp'], y=df_volume['volume'], name='Volume', marker_color='blue'))
-    volume_fig.update_layout(
-        title=f'{symbol.capitalize()} Trading Volume ({time_range} Days)', 
-        xaxis_title='Date', 
-        yaxis_title='Volume',
-        template='plotly_white'
-    )
-    
-    # Moving Average Chart
-    ma_fig = go.Figure()
-    ma_fig.add_trace(go.Scatter(x=df['timestamp'], y=df['price'], mode='lines', name='Price'))
-    ma_fig.add_trace(go.Scatter(x=df['timestamp'], y=df['7-day MA'], mode='lines', name='7-day MA', line=dict(dash='dash', color='red')))
-    ma_fig.add_trace(go.Scatter(x=df['timestamp'], y=df['30-day MA'], mode='lines', name='30-day MA', line=dict(dash='dot', color='green')))
-    ma_fig.update_layout(
-        title=f'{symbol.capitalize()} Moving Averages ({time_range} Days)', 
-        xaxis_title='Date', 
-        yaxis_title='Price (USD)',
-        template='plotly_white'
-    )
-    
-    # Price vs Volume Comparison Chart
-    comparison_fig = go.Figure()
-    comparison_fig.add_trace(go.Scatter(x=df['timestamp'], y=df['price'], mode='lines', name='Price', yaxis='y1'))
-    comparison_fig.add_trace(go.Bar(x=df_volume['timestamp'], y=df_volume['volume'], name='Volume', marker_color='blue', yaxis='y2', opacity=0.7))
-    comparison_fig.update_layout(
-        title=f'{symbol.capitalize()} Price vs Volume ({time_range} Days)',
-        xaxis_title='Date',
-        yaxis={'title': 'Price (USD)', 'side': 'left'},
-        yaxis2={'title': 'Volume', 'side': 'right', 'overlaying': 'y'},
-        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='center', x=0.5),
-        template='plotly_white'
-    )
-    
-    # Price Change Percentage Chart
-    price_change_fig = go.Figure()
-    price_change_fig.add_trace(go.Bar(
-        x=df['timestamp'], 
-        y=df['Price Change %'], 
-        name='Price Change %',
-        marker_color=np.where(df['Price Change %'] >= 0, 'green', 'red')
-    ))
-    price_change_fig.update_layout(
-        title=f'{symbol.capitalize()} Daily Price Change (%) ({time_range} Days)', 
-        xaxis_title='Date', 
-        yaxis_title='Percentage Change',
-        template='plotly_white'
-    )
-    
-    # Bollinger Bands Chart
-    bollinger_fig = go.Figure()
-    bollinger_fig.add_trace(go.Scatter(
-        x=df['timestamp'], 
-        y=df['Upper Band'], 
-        mode='lines', 
-        name='Upper Band', 
-        line=dict(width=1, color='rgba(173, 204, 255, 0.7)'),
-        showlegend=True
-    ))
-    bollinger_fig.add_trace(go.Scatter(
-        x=df['timestamp'], 
-        y=df['Lower Band'], 
-        mode='lines', 
-        name='Lower Band', 
-        line=dict(width=1, color='rgba(173, 204, 255, 0.7)'),
-        fill='tonexty', 
-        fillcolor='rgba(173, 204, 255, 0.2)',
-        showlegend=True
-    ))
-    bollinger_fig.add_trace(go.Scatter(x=df['timestamp'], y=df['20-day MA'], mode='lines', name='20-day MA', line=dict(width=2, color='rgba(44, 130, 201, 1)')))
-    bollinger_fig.add_trace(go.Scatter(x=df['timestamp'], y=df['price'], mode='lines', name='Price', line=dict(width=2, color='black')))
-    bollinger_fig.update_layout(
-        title=f'{symbol.capitalize()} Bollinger Bands ({time_range} Days)', 
-        xaxis_title='Date', 
-        yaxis_title='Price (USD)',
-        template='plotly_white',
-        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='center', x=0.5)
-    )
-    
-    # RSI Chart
-    rsi_fig = go.Figure()
-    rsi_fig.add_trace(go.Scatter(x=df['timestamp'], y=df['RSI'], mode='lines', name='RSI', line=dict(color='purple', width=2)))
-    # Add overbought/oversold reference lines
-    rsi_fig.add_shape(
-        type='line', x0=df['timestamp'].min(), x1=df['timestamp'].max(), y0=70, y1=70,
-        line=dict(color='red', dash='dash')
-    )
-    rsi_fig.add_shape(
-        type='line', x0=df['timestamp'].min(), x1=df['timestamp'].max(), y0=30, y1=30,
-        line=dict(color='green', dash='dash')
-    )
-    rsi_fig.add_annotation(x=df['timestamp'].max(), y=70, text="Overbought", showarrow=False, xshift=10)
-    rsi_fig.add_annotation(x=df['timestamp'].max(), y=30, text="Oversold", showarrow=False, xshift=10)
-    rsi_fig.update_layout(
-        title=f'{symbol.capitalize()} RSI (14-day) ({time_range} Days)',
-        xaxis_title='Date',
-        yaxis_title='RSI',
-        yaxis=dict(range=[0, 100]),
-        template='plotly_white'
-    )
-    
-    # MACD Chart
-    macd_fig = go.Figure()
-    macd_fig.add_trace(go.Bar(
-        x=df['timestamp'], 
-        y=df['MACD Histogram'], 
-        name='Histogram',
-        marker_color=np.where(df['MACD Histogram'] >= 0, 'rgba(0, 153, 0, 0.7)', 'rgba(255, 51, 51, 0.7)')
-    ))
-    macd_fig.add_trace(go.Scatter(x=df['timestamp'], y=df['MACD'], mode='lines', name='MACD', line=dict(color='blue', width=2)))
-    macd_fig.add_trace(go.Scatter(x=df['timestamp'], y=df['Signal Line'], mode='lines', name='Signal', line=dict(color='red', width=1.5)))
-    macd_fig.update_layout(
-        title=f'{symbol.capitalize()} MACD ({time_range} Days)',
-        xaxis_title='Date',
-        yaxis_title='MACD',
-        template='plotly_white',
-        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='center', x=0.5)
-    )
-    
-    # Cumulative Return Chart
-    cum_return_fig = go.Figure()
-    cum_return_fig.add_trace(go.Scatter(
-        x=df['timestamp'], 
-        y=df['Cumulative Return']*100, 
-        mode='lines', 
-        name='Cumulative Return',
-        line=dict(color='darkblue', width=2),
-        fill='tozeroy', 
-        fillcolor='rgba(0, 0, 255, 0.1)'
-    ))
-    cum_return_fig.update_layout(
-        title=f'{symbol.capitalize()} Cumulative Return ({time_range} Days)', 
-        xaxis_title='Date', 
-        yaxis_title='Cumulative Return (%)',
-        template='plotly_white'
+def update_indicator_cache(symbol, time_range, previous):
+    # Fetch here so the chart callbacks don't each miss the cache and hit the API, then build
+    # the figures concurrently so the chart callbacks only read them back from chart_figure
+    data_key = chart_data_key(symbol, time_range)
+    if data_key is not None:
+        list(_figure_pool.map(lambda graph_id: chart_figure(graph_id, symbol, time_range, data_key), CHART_BUILDERS))
+    # Charts get full figures until a selection with data has rendered them; only then do input
+    # changes send just the data. A patch on a chart whose first load failed would build untyped
+    # traces with no layout. Every chart updates, or skips, on the same data key
+    rendered = bool(previous and previous['rendered'])
+    return {
+        'symbol': symbol,
+        'time_range': time_range,
+        # The chart callbacks take the data key from here rather than each fetching the data again
+        'data_key': data_key,
+        'full': not rendered,
+        'rendered': rendered or data_key is not None
+    }
+
+def register_chart_callback(graph_id):
+    @app.callback(
+        Output(graph_id, 'figure'),
+        Input('indicator-cache', 'data'),
+        prevent_initial_call=True
     )
-    
-    return (price_fig, volume_fig, ma_fig, comparison_fig, price_change_fig,
-            bollinger_fig, rsi_fig, macd_fig, cum_return_fig)
+    def update_chart(selection):
+        # No data for this selection (API error or rate limit); keep the charts as they are
+        if selection['data_key'] is None:
+            raise dash.exceptions.PreventUpdate
+        symbol, time_range = selection['symbol'], selection['time_range']
+        fig = chart_figure(graph_id, symbol, time_range, tuple(selection['data_key']))
+        if selection['full']:
+            return fig
+        return figure_patch(fig)
+
+# Callbacks to update cryptocurrency charts
+for graph_id in CHART_BUILDERS:
+    register_chart_callback(graph_id)
 
 # Run server
 if __name__ == '__main__':
@@ -0,0 +1,86 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # Without numba the kernel below runs as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# Price change, cumulative return, Bollinger Bands, RSI and MACD computed together in one
+# pass over the prices. Returns (ma, upper, lower, rsi, macd, signal, hist, cum_return, pct_change)
+@njit(cache=True)
+def compute_all(price, n_bb=20, n_rsi=14, n_fast=12, n_slow=26, n_sig=9):
+    n = price.shape[0]
+    ma = np.full(n, np.nan)
+    upper = np.full(n, np.nan)
+    lower = np.full(n, np.nan)
+    rsi = np.full(n, np.nan)
+    macd = np.empty(n)
+    signal = np.empty(n)
+    hist = np.empty(n)
+    cum_return = np.full(n, np.nan)
+    pct_change = np.full(n, np.nan)
+    a_fast = 2.0 / (n_fast + 1)
+    a_slow = 2.0 / (n_slow + 1)
+    a_sig = 2.0 / (n_sig + 1)
+    gain = np.zeros(n)
+    loss = np.zeros(n)
+    sum_gain = 0.0
+    sum_loss = 0.0
+    ema_fast = 0.0
+    ema_slow = 0.0
+    sig = 0.0
+    growth = 1.0
+    for i in range(n):
+        # Daily and cumulative returns
+        if i > 0:
+            daily_return = price[i] / price[i - 1] - 1
+            pct_change[i] = daily_return * 100
+            growth *= 1 + daily_return
+            cum_return[i] = growth - 1
+
+        # MACD from two exponential moving averages (pandas ewm with adjust=False)
+        if i == 0:
+            ema_fast = price[0]
+            ema_slow = price[0]
+        else:
+            ema_fast = a_fast * price[i] + (1.0 - a_fast) * ema_fast
+            ema_slow = a_slow * price[i] + (1.0 - a_slow) * ema_slow
+        macd[i] = ema_fast - ema_slow
+        sig = macd[i] if i == 0 else a_sig * macd[i] + (1.0 - a_sig) * sig
+        signal[i] = sig
+        hist[i] = macd[i] - sig
+
+        # RSI from rolling sums of gains and losses
+        if i > 0:
+            delta = price[i] - price[i - 1]
+            if delta > 0:
+                gain[i] = delta
+            elif delta < 0:
+                loss[i] = -delta
+        sum_gain += gain[i]
+        sum_loss += loss[i]
+        if i >= n_rsi:
+            sum_gain -= gain[i - n_rsi]
+            sum_loss -= loss[i - n_rsi]
+        if i >= n_rsi - 1:
+            if sum_loss != 0.0:
+                rsi[i] = 100.0 - 100.0 / (1.0 + sum_gain / sum_loss)
+            elif sum_gain > 0.0:
+                rsi[i] = 100.0
+
+        # Bollinger Bands from the 20-day mean and sample standard deviation
+        if i >= n_bb - 1:
+            mean = 0.0
+            for k in range(i - n_bb + 1, i + 1):
+                mean += price[k]
+            mean /= n_bb
+            var = 0.0
+            for k in range(i - n_bb + 1, i + 1):
+                var += (price[k] - mean) ** 2
+            std = np.sqrt(var / (n_bb - 1))
+            ma[i] = mean
+            upper[i] = mean + 2 * std
+            lower[i] = mean - 2 * std
+    return ma, upper, lower, rsi, macd, signal, hist, cum_return, pct_change